@@ -1,5 +1,5 @@
 import streamlit as st
-from generator import generate_names
+from utils import cached_generate_names
 
 st.set_page_config(page_title="Nombre Veneco Generator", layout="centered")
 
@@ -28,7 +28,7 @@ if submitted:
     if not father or not mother:
         st.error("Completa ambos nombres (papá y mamá).")
     else:
-        names = generate_names(
+        names = cached_generate_names(
             father=father,
             mother=mother,
             gender=gender,
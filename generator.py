@@ -1,49 +1,116 @@
 from __future__ import annotations
 
+import heapq
 import random
 import re
 import unicodedata
-from dataclasses import dataclass
-from typing import List, Tuple
+from functools import lru_cache
+from itertools import accumulate
+from operator import itemgetter
+from typing import Callable, Dict, List, Tuple
 
 
-VOWELS = set("aeiou")
+VOWELS_SET = frozenset("aeiou")
+VOWELS_TUPLE = ("a", "e", "i", "o", "u")
 ALPHABET = set("abcdefghijklmnopqrstuvwxyz")
 
+_CONSONANTS = "bcdfghjklmnpqrstvwxyz"
+
+_RE_WS = re.compile(r"\s+")
+_RE_ENYE = re.compile(r"([ñÑ])")
+_RE_JH = re.compile(r"j+h")
+_RE_QXZ = re.compile(r"[qxz]{2,}")
+# dos consonantes seguidas de una tercera (la ñ no cuenta como consonante aquí)
+_RE_CCC = re.compile(f"[{_CONSONANTS}]{{2}}(?=[{_CONSONANTS}])")
+
+# Puntuación: patrones culturales y rasgos que premia/penaliza _score_name
+_CULTURAL = ("yus", "yub", "jhon", "maik", "mayk", "deiv", "jhair", "nath", "mar", "lis", "any", "eth", "yei", "yon")
+# lookahead: encuentra también coincidencias solapadas (p. ej. "any" y "yon" en "anyon")
+_RE_CULTURAL = re.compile("(?=(" + "|".join(map(re.escape, _CULTURAL)) + "))")
+_RE_NO_VOWEL_TRI = re.compile(r"(?=[^aeiou]{3})")
+_RE_WORST_MARKS = re.compile(r"jh|nhy")
+_NOISY_STARTS = ("yh", "jh", "nh")
+_FEM_ENDINGS = ("a", "y", "is", "any", "eth", "lis", "mar", "elis", "ia")
+_MASC_ENDINGS = ("o", "el", "en", "son", "iel", "is", "any", "mar")
+
+
+class _KeepOnly(dict):
+    """
+    Tabla para str.translate que borra todo carácter fuera de `keep`.
+    Se llena bajo demanda, así sirve para cualquier codepoint.
+    """
+
+    def __init__(self, keep: str, keep_spaces: bool = False) -> None:
+        super().__init__()
+        self._keep = frozenset(keep)
+        self._keep_spaces = keep_spaces
+
+    def __missing__(self, cp: int):
+        ch = chr(cp)
+        value = cp if ch in self._keep or (self._keep_spaces and ch.isspace()) else None
+        self[cp] = value
+        return value
+
+
+_KEEP_LETTERS = _KeepOnly("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZñÑ", keep_spaces=True)
+_KEEP_LOWER = _KeepOnly("abcdefghijklmnopqrstuvwxyzñ")
+# borra las letras válidas: si queda algo, el nombre trae caracteres inválidos
+_INVALID_TRANS = str.maketrans("", "", "abcdefghijklmnopqrstuvwxyzñ")
+
 
 # Morfemas típicos “venecos” (no académicos; estética cultural popular)
-VENCO_PREFIXES_M = [
+VENCO_PREFIXES_M = (
     "yus", "yub", "jhon", "jho", "jh", "jhair", "jha",
     "maik", "mayk", "deiv", "yei", "yon", "yoh", "jei",
-    "dai", "day", "key", "kei"
-]
+    "dai", "day", "key", "kei",
+)
 
-VENCO_PREFIXES_H = [
+VENCO_PREFIXES_H = (
     "jhon", "jho", "jh", "yus", "maik", "mayk", "deiv",
     "jhair", "wil", "and", "bra", "kev", "yon", "yei",
-    "dai", "day", "kei", "key"
-]
+    "dai", "day", "kei", "key",
+)
 
-VENCO_SUFFIXES_M = [
+VENCO_SUFFIXES_M = (
     "mar", "mary", "mari", "elis", "elys", "liss", "lis",
     "any", "aney", "eth", "eith", "y", "is", "nys", "dys",
-    "a", "ia"
-]
+    "a", "ia",
+)
 
-VENCO_SUFFIXES_H = [
+VENCO_SUFFIXES_H = (
     "son", "sone", "sen", "el", "iel", "en", "an", "is",
-    "air", "er", "eth", "y", "n", "d", "o"
-]
+    "air", "er", "eth", "y", "n", "d", "o",
+)
+
+VENCO_LINKERS = ("a", "e", "i", "o", "u", "y", "h")
+
+# Ruido de suavizado (Veneco / Worst-case)
+_VENECO_NOISE_PREFIXES = ("jho", "jhon", "jhair", "maik", "yus", "deiv", "mayk")
+_WORST_PREFIXES = ("yh", "jh", "nhy", "yhajh", "jha", "yha", "nh")
+_WORST_SUFFIXES = ("leth", "air", "eith", "x", "h", "th", "lynth")
+_WORST_INSERTS = ("h", "y", "jh")
+_WORST_C_SWAPS = ("k", "s")
 
-VENCO_LINKERS = ["a", "e", "i", "o", "u", "y", "h"]
+# Plantillas del modo Veneco (P=prefijo, F=papá, M=mamá, S=sufijo, L=enlace)
+# con pesos acumulados precalculados para random.choices
+_VENECO_TEMPLATES = ("P+M", "F+S", "P+F+S", "P+M+S", "P+L+M", "F+L+S", "P+F", "M+S", "P+L+F+S")
+_VENECO_CUM = tuple(accumulate((16, 12, 14, 14, 10, 8, 10, 8, 8)))
+
+# (papá, mamá, final) para los modos no venecos
+_PATTERNS: Tuple[Tuple[int, int, int], ...] = (
+    (1, 1, 0),
+    (1, 0, 1),
+    (0, 1, 1),
+    (1, 1, 1),
+)
 
 
 def _normalize_letters(s: str) -> str:
     s = s.strip()
-    s = re.sub(r"\s+", " ", s)
+    s = _RE_WS.sub(" ", s)
     s = s.replace("-", " ")
     # Solo letras y espacios; preserva ñ si viene escrita
-    s = re.sub(r"[^A-Za-zñÑ\s]", "", s)
+    s = s.translate(_KEEP_LETTERS)
     return s
 
 
@@ -57,183 +124,219 @@ def _titlecase_name(s: str) -> str:
     return s[0].upper() + s[1:].lower()
 
 
+@lru_cache(maxsize=1024)
 def _strip_accents_keep_enye(s: str) -> str:
     # quita acentos pero mantiene ñ
+    if s.isascii():
+        return s
+    # NFD sí descompone la ñ (n + tilde): se normaliza solo lo que hay entre ñ's
     out = []
-    for ch in s:
-        if ch in ("ñ", "Ñ"):
-            out.append(ch)
+    for part in _RE_ENYE.split(s):
+        if part in ("ñ", "Ñ"):
+            out.append(part)
             continue
-        decomp = unicodedata.normalize("NFD", ch)
-        decomp = "".join(c for c in decomp if unicodedata.category(c) != "Mn")
-        out.append(decomp)
+        decomp = unicodedata.normalize("NFD", part)
+        out.append("".join(c for c in decomp if unicodedata.category(c) != "Mn"))
     return "".join(out)
 
 
-def _syllableish_chunks(name: str) -> List[str]:
+@lru_cache(maxsize=256)
+def _syllableish_chunks(name: str) -> Tuple[str, ...]:
     """
     Segmentación práctica: ventanas 2-4 + prefijos/sufijos típicos.
     No es silabificación estricta: es ingeniería fonética.
     """
     n = _lower_ascii(_strip_accents_keep_enye(name))
-    n = re.sub(r"\s+", "", n)
+    n = _RE_WS.sub("", n)
     if len(n) < 2:
-        return [n] if n else []
+        return (n,) if n else ()
 
-    chunks = set()
+    # un set por longitud: todo trozo de la ventana L mide exactamente L
+    by_len = {L: set() for L in (2, 3, 4)}
 
-    # prefijos/sufijos 2-4
-    for L in (2, 3, 4):
+    for L, chunks in by_len.items():
         if len(n) >= L:
+            # prefijos/sufijos 2-4
             chunks.add(n[:L])
             chunks.add(n[-L:])
-
-    # ventanas internas 2-4
-    for L in (2, 3, 4):
+        # ventanas internas 2-4
         for i in range(1, max(1, len(n) - L)):
             chunks.add(n[i:i + L])
 
-    chunks = {c for c in chunks if c}
-    # orden estable: preferir 3-4
-    return sorted(chunks, key=lambda x: (abs(len(x) - 3), -len(x), x))
+    # orden estable: preferir 3-4 (luego 2), alfabético dentro de cada longitud
+    return tuple(c for L in (3, 4, 2) for c in sorted(by_len[L]))
 
 
-def _join_with_smoothing(parts: List[str], rng: random.Random, mode: str) -> str:
+def _collapse_triples(s: str) -> str:
+    """Deja como máximo 2 repeticiones seguidas de cualquier carácter ("aaa" -> "aa")."""
+    out = []
+    prev = ""
+    run = 0
+    for ch in s:
+        if ch == prev:
+            run += 1
+            if run < 2:
+                out.append(ch)
+        else:
+            prev = ch
+            run = 0
+            out.append(ch)
+    return "".join(out)
+
+
+def _prep(parts: List[str], rng: random.Random) -> str:
+    """Limpieza + suavizado común a todos los modos."""
     s = "".join(parts)
 
     # limpieza
-    s = re.sub(r"\s+", "", s)
-    s = re.sub(r"[^a-zñ]", "", s)
-
-    def is_vowel(ch: str) -> bool:
-        return ch in VOWELS
+    s = _RE_WS.sub("", s)
+    s = s.translate(_KEEP_LOWER)
 
     # suavizado: evita 3 consonantes seguidas insertando vocal
-    out = []
-    for ch in s:
-        out.append(ch)
-        if len(out) >= 3:
-            a, b, c = out[-3], out[-2], out[-1]
-            if (not is_vowel(a)) and (not is_vowel(b)) and (not is_vowel(c)) and (a != "ñ") and (b != "ñ") and (c != "ñ"):
-                out.insert(-1, rng.choice(list(VOWELS)))
-
-    s = "".join(out)
+    s = _RE_CCC.sub(lambda m: m.group(0) + rng.choice(VOWELS_TUPLE), s)
 
     # reduce repeticiones extremas
-    s = re.sub(r"(.)\1\1+", r"\1\1", s)
+    s = _collapse_triples(s)
+    return s
 
-    if mode == "Normal":
-        s = s.replace("hh", "h").replace("yy", "y")
-        s = re.sub(r"j+h", "j", s)  # evita jh redundante
-        return s
 
-    if mode == "Veneco":
-        # agrega “ruido cultural” pero con variedad controlada
-        if rng.random() < 0.18:
-            pos = rng.randrange(1, len(s))
-            s = s[:pos] + "h" + s[pos:]
-        if "y" not in s and rng.random() < 0.25:
-            pos = rng.randrange(0, len(s))
-            s = s[:pos] + "y" + s[pos:]
-        # prefijo cultural ocasional, variando (evita monotonear con solo jho)
-        if rng.random() < 0.18:
-            pref = rng.choice(["jho", "jhon", "jhair", "maik", "yus", "deiv", "mayk"])
-            s = pref + s[1:]
-        return s
+def _smooth_normal(parts: List[str], rng: random.Random) -> str:
+    s = _prep(parts, rng)
+    s = s.replace("hh", "h").replace("yy", "y")
+    s = _RE_JH.sub("j", s)  # evita jh redundante
+    return s
 
-    if mode == "Worst-case":
-        prefixes = ["yh", "jh", "nhy", "yhajh", "jha", "yha", "nh"]
-        suffixes = ["leth", "air", "eith", "x", "h", "th", "lynth"]
-        s = rng.choice(prefixes) + s
 
-        for _ in range(rng.randint(1, 3)):
-            pos = rng.randrange(1, len(s))
-            s = s[:pos] + rng.choice(["h", "y", "jh"]) + s[pos:]
+def _smooth_veneco(parts: List[str], rng: random.Random) -> str:
+    s = _prep(parts, rng)
+    # agrega “ruido cultural” pero con variedad controlada
+    if rng.random() < 0.18:
+        pos = rng.randrange(1, len(s))
+        s = s[:pos] + "h" + s[pos:]
+    if "y" not in s and rng.random() < 0.25:
+        pos = rng.randrange(0, len(s))
+        s = s[:pos] + "y" + s[pos:]
+    # prefijo cultural ocasional, variando (evita monotonear con solo jho)
+    if rng.random() < 0.18:
+        pref = rng.choice(_VENECO_NOISE_PREFIXES)
+        s = pref + s[1:]
+    return s
 
-        s = s + rng.choice(suffixes)
 
-        s = s.replace("qu", "k")
-        s = s.replace("c", rng.choice(["k", "s"]))
-        return s
+def _smooth_worstcase(parts: List[str], rng: random.Random) -> str:
+    s = _prep(parts, rng)
+    # inserciones sobre un buffer de caracteres; se une una sola vez
+    buf = list(rng.choice(_WORST_PREFIXES) + s)
+
+    for _ in range(rng.randint(1, 3)):
+        pos = rng.randrange(1, len(buf))
+        buf[pos:pos] = rng.choice(_WORST_INSERTS)
 
+    buf += rng.choice(_WORST_SUFFIXES)
+    s = "".join(buf)
+
+    s = s.replace("qu", "k")
+    s = s.replace("c", rng.choice(_WORST_C_SWAPS))
     return s
 
 
-def _gender_endings(gender: str, mode: str) -> List[str]:
-    if mode == "Worst-case":
-        return ["", "h", "th", "x", "leth"]
+_SMOOTHERS: Dict[str, Callable[[List[str], random.Random], str]] = {
+    "Normal": _smooth_normal,
+    "Veneco": _smooth_veneco,
+    "Worst-case": _smooth_worstcase,
+}
 
-    if gender == "M":
-        return ["a", "y", "is", "any", "elis", "mar", "lis", "eth", "ia"]
-    return ["o", "el", "en", "son", "iel", "is", "any", "mar"]
 
+def _smoother_for(mode: str) -> Callable[[List[str], random.Random], str]:
+    # modos desconocidos: solo limpieza + suavizado común
+    return _SMOOTHERS.get(mode, _prep)
 
-@dataclass(frozen=True)
-class Candidate:
-    name: str
-    score: float
 
+def _join_with_smoothing(parts: List[str], rng: random.Random, mode: str) -> str:
+    return _smoother_for(mode)(parts, rng)
+
+
+def _gender_endings(gender: str, mode: str) -> Tuple[str, ...]:
+    if mode == "Worst-case":
+        return ("", "h", "th", "x", "leth")
+
+    if gender == "M":
+        return ("a", "y", "is", "any", "elis", "mar", "lis", "eth", "ia")
+    return ("o", "el", "en", "son", "iel", "is", "any", "mar")
 
-def _score_name(name: str, gender: str, mode: str) -> float:
-    n = name.lower()
-    base = 0.0
-    length = len(n)
-
-    if mode != "Worst-case":
-        if 5 <= length <= 10:
-            base += 3.0
-        elif 4 <= length <= 12:
-            base += 1.5
-        else:
-            base -= 2.0
-    else:
-        if length >= 10:
-            base += 3.0
-        if length >= 14:
-            base += 2.0
-
-    if mode != "Worst-case":
-        penalties = 0
-        for i in range(length - 2):
-            tri = n[i:i + 3]
-            if all(ch not in VOWELS for ch in tri if ch != "ñ"):
-                penalties += 1
-        base -= 0.9 * penalties
-
-    cultural = ["yus", "yub", "jhon", "maik", "mayk", "deiv", "jhair", "nath", "mar", "lis", "any", "eth", "yei", "yon"]
-    hits = sum(1 for p in cultural if p in n)
+
+@lru_cache(maxsize=None)
+def _name_scorer(gender: str, mode: str) -> Callable[[str], float]:
+    """
+    Devuelve la función de puntuación ya especializada para (gender, mode):
+    las ramas por modo/género se resuelven aquí una vez, no por candidato.
+    """
+    worst = mode == "Worst-case"
 
     if mode == "Veneco":
-        base += 1.2 * hits
-        if n.startswith(("yh", "jh", "nh")):
-            base += 0.6
+        hit_weight, noisy_start, worst_marks = 1.2, 0.6, False
     elif mode == "Normal":
-        base += 0.4 * hits
-        if n.startswith(("yh", "jh", "nh")):
-            base -= 1.0
+        hit_weight, noisy_start, worst_marks = 0.4, -1.0, False
     else:
-        base += 1.6 * hits
-        if n.startswith(("yh", "jh", "nh")):
-            base += 2.0
-        if "h" in n:
-            base += 1.0
-        if n.count("y") >= 1:
-            base += 1.0
-        if any(x in n for x in ["jh", "yhajh", "nhy"]):
-            base += 2.0
-
-    if any(ch not in ALPHABET and ch not in {"ñ"} for ch in n):
-        base -= 10.0
-
-    if mode != "Worst-case":
-        fem_bias = n.endswith(("a", "y", "is", "any", "eth", "lis", "mar", "elis", "ia"))
-        masc_bias = n.endswith(("o", "el", "en", "son", "iel", "is", "any", "mar"))
-        if gender == "M" and fem_bias:
-            base += 0.5
-        if gender == "H" and masc_bias:
+        hit_weight, noisy_start, worst_marks = 1.6, 2.0, True
+
+    if worst:
+        bias_endings: Tuple[str, ...] = ()
+    elif gender == "M":
+        bias_endings = _FEM_ENDINGS
+    elif gender == "H":
+        bias_endings = _MASC_ENDINGS
+    else:
+        bias_endings = ()
+
+    def score(name: str) -> float:
+        n = name.lower()
+        base = 0.0
+        length = len(n)
+
+        if not worst:
+            if 5 <= length <= 10:
+                base += 3.0
+            elif 4 <= length <= 12:
+                base += 1.5
+            else:
+                base -= 2.0
+
+            penalties = len(_RE_NO_VOWEL_TRI.findall(n))
+            base -= 0.9 * penalties
+        else:
+            if length >= 10:
+                base += 3.0
+            if length >= 14:
+                base += 2.0
+
+        # cada patrón cuenta una vez, aunque aparezca repetido
+        hits = len(set(_RE_CULTURAL.findall(n)))
+        base += hit_weight * hits
+        if n.startswith(_NOISY_STARTS):
+            base += noisy_start
+
+        if worst_marks:
+            if "h" in n:
+                base += 1.0
+            if "y" in n:
+                base += 1.0
+            if _RE_WORST_MARKS.search(n):
+                base += 2.0
+
+        if n.translate(_INVALID_TRANS):
+            base -= 10.0
+
+        if bias_endings and n.endswith(bias_endings):
             base += 0.5
 
-    return base
+        return base
+
+    return score
+
+
+def _score_name(name: str, gender: str, mode: str) -> float:
+    return _name_scorer(gender, mode)(name)
 
 
 def generate_names(
@@ -253,6 +356,10 @@ def generate_names(
     father = _normalize_letters(father)
     mother = _normalize_letters(mother)
 
+    # formas normalizadas: se calculan una vez, no por intento
+    f_norm = _RE_WS.sub("", _lower_ascii(_strip_accents_keep_enye(father)))
+    m_norm = _RE_WS.sub("", _lower_ascii(_strip_accents_keep_enye(mother)))
+
     f_chunks = _syllableish_chunks(father)
     m_chunks = _syllableish_chunks(mother)
     if not f_chunks or not m_chunks:
@@ -263,25 +370,6 @@ def generate_names(
     # para k=1..5 no necesitas miles de intentos
     attempts = max(320, k * 90)
 
-    patterns: List[Tuple[int, int, int]] = [
-        (1, 1, 0),
-        (1, 0, 1),
-        (0, 1, 1),
-        (1, 1, 1),
-    ]
-
-    def pick_prefix(chunks: List[str]) -> str:
-        c = chunks[: min(len(chunks), 12)]
-        return rng.choice(c)
-
-    def pick_suffix_from_name(name: str) -> str:
-        n = _lower_ascii(_strip_accents_keep_enye(name))
-        n = re.sub(r"\s+", "", n)
-        if len(n) <= 3:
-            return n
-        L = rng.choice([2, 3, 4])
-        return n[-L:]
-
     # pools venecos por género
     if gender == "M":
         v_prefixes = VENCO_PREFIXES_M
@@ -290,26 +378,47 @@ def generate_names(
         v_prefixes = VENCO_PREFIXES_H
         v_suffixes = VENCO_SUFFIXES_H
 
-    candidates: dict[str, Candidate] = {}
+    # trozos preferidos de cada nombre y finales posibles del de la mamá
+    f_top = f_chunks[:12]
+    m_top = m_chunks[:12]
+    if len(m_norm) <= 3:
+        m_tails: Tuple[str, ...] = (m_norm,)
+    else:
+        m_tails = (m_norm[-2:], m_norm[-3:], m_norm[-4:])
+
+    # sorteos por lote: una llamada por pool en vez de una por intento
+    # (el suavizado sigue tirando de `rng` dentro del bucle)
+    draws = rng.choices
+    coins = [rng.random() for _ in range(attempts)]
+    f_picks = draws(f_top, k=attempts)
+    m_picks = draws(m_top, k=attempts)
+    tail_picks = draws(m_tails, k=attempts)
+
+    if mode == "Veneco":
+        templates = draws(_VENECO_TEMPLATES, cum_weights=_VENECO_CUM, k=attempts)
+        p_picks = draws(v_prefixes, k=attempts)
+        s_picks = draws(v_suffixes, k=attempts)
+        l_picks = draws(VENCO_LINKERS, k=attempts)
+    else:
+        shapes = draws(_PATTERNS, k=attempts)
+        e_picks = draws(endings, k=attempts)
 
-    f_norm = re.sub(r"\s+", "", _lower_ascii(_strip_accents_keep_enye(father)))
-    m_norm = re.sub(r"\s+", "", _lower_ascii(_strip_accents_keep_enye(mother)))
+    smooth = _smoother_for(mode)
+    score_name = _name_scorer(gender, mode)
+    # nombre -> mejor puntuación vista
+    candidates: dict[str, float] = {}
 
-    for _ in range(attempts):
+    for i in range(attempts):
         # Modo Veneco: plantillas + morfemas + familia (sube diversidad real)
         if mode == "Veneco":
-            template = rng.choices(
-                population=["P+M", "F+S", "P+F+S", "P+M+S", "P+L+M", "F+L+S", "P+F", "M+S", "P+L+F+S"],
-                weights=[16, 12, 14, 14, 10, 8, 10, 8, 8],
-                k=1
-            )[0]
+            template = templates[i]
 
-            P = rng.choice(v_prefixes)
-            S = rng.choice(v_suffixes)
-            L = rng.choice(VENCO_LINKERS)
+            P = p_picks[i]
+            S = s_picks[i]
+            L = l_picks[i]
 
-            F = pick_prefix(f_chunks)
-            M = pick_suffix_from_name(mother) if rng.random() < 0.70 else pick_prefix(m_chunks)
+            F = f_picks[i]
+            M = tail_picks[i] if coins[i] < 0.70 else m_picks[i]
 
             if template == "P+M":
                 parts = [P, M]
@@ -330,20 +439,20 @@ def generate_names(
             else:  # "M+S"
                 parts = [M, S]
 
-            name_raw = _join_with_smoothing(parts, rng, mode)
+            name_raw = smooth(parts, rng)
 
         else:
-            use_f, use_m, use_e = rng.choice(patterns)
+            use_f, use_m, use_e = shapes[i]
             parts = []
 
             if use_f:
-                parts.append(pick_prefix(f_chunks))
+                parts.append(f_picks[i])
             if use_m:
-                parts.append(pick_suffix_from_name(mother) if rng.random() < 0.6 else pick_prefix(m_chunks))
+                parts.append(tail_picks[i] if coins[i] < 0.6 else m_picks[i])
             if use_e:
-                parts.append(rng.choice(endings))
+                parts.append(e_picks[i])
 
-            name_raw = _join_with_smoothing(parts, rng, mode)
+            name_raw = smooth(parts, rng)
 
         if not name_raw or len(name_raw) < 4:
             continue
@@ -351,15 +460,15 @@ def generate_names(
         if mode != "Worst-case" and (name_raw == f_norm or name_raw == m_norm):
             continue
 
-        if mode != "Worst-case" and re.search(r"[qxz]{2,}", name_raw):
+        if mode != "Worst-case" and _RE_QXZ.search(name_raw):
             continue
 
-        score = _score_name(name_raw, gender, mode)
-        key = name_raw
-        prev = candidates.get(key)
-        if prev is None or score > prev.score:
-            candidates[key] = Candidate(name=key, score=score)
+        score = score_name(name_raw)
+        prev = candidates.get(name_raw)
+        if prev is None or score > prev:
+            candidates[name_raw] = score
 
-    ranked = sorted(candidates.values(), key=lambda c: c.score, reverse=True)
-    out = [_titlecase_name(c.name) for c in ranked[:k]]
+    # solo importan los k mejores: O(N log k) en vez de ordenar todo
+    ranked = heapq.nlargest(k, candidates.items(), key=itemgetter(1))
+    out = [_titlecase_name(name) for name, _ in ranked]
     return out
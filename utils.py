@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from typing import List
+
+import streamlit as st
+
+from generator import generate_names
+
+
+# generate_names es determinista para los mismos parámetros (incluida la semilla):
+# repetir la misma combinación no tiene por qué volver a generar
+@st.cache_data(show_spinner=False)
+def cached_generate_names(
+    father: str,
+    mother: str,
+    gender: str,
+    mode: str,
+    k: int,
+    seed: int,
+) -> List[str]:
+    return generate_names(
+        father=father,
+        mother=mother,
+        gender=gender,
+        mode=mode,
+        k=k,
+        seed=seed,
+    )